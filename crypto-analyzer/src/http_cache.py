@@ -0,0 +1,75 @@
+"""Respostas HTTP condicionais (ETag/Last-Modified/304) e cabeçalhos de cache
+
+O ETag é calculado a partir das versões dos dados upstream usados pela rota
+(e dos parâmetros da requisição), antes de qualquer cálculo ou serialização.
+Quando o cliente já possui a versão atual, a rota responde 304 sem chamar
+a função que monta o payload.
+
+Rotas que montam o próprio payload devem passar em `extra` um token de versão
+do formato (incrementado quando a saída do builder muda), para que clientes
+com ETags antigos não recebam 304 após um deploy.
+"""
+import hashlib
+from datetime import datetime, timezone
+
+from flask import jsonify, make_response, request
+
+
+def make_etag(entries, extra=()):
+    """Gera um ETag forte a partir da rota, dos parâmetros e das versões dos dados"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(request.path.encode())
+    for key, value in sorted(request.args.items(multi=True)):
+        digest.update(f"\0{key}={value}".encode())
+    for entry in entries:
+        digest.update(b"\0" + (entry['version'] if entry else 'missing').encode())
+    for value in extra:
+        digest.update(f"\0{value}".encode())
+    return digest.hexdigest()
+
+
+def _last_modified(entries):
+    timestamps = [entry['fetched_at'] for entry in entries if entry]
+    if not timestamps:
+        return None
+    return datetime.fromtimestamp(int(max(timestamps)), timezone.utc)
+
+
+def _not_modified(etag, last_modified):
+    # If-None-Match tem precedência sobre If-Modified-Since (RFC 9110)
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def cached_json(build, entries, max_age, stale_while_revalidate=None, extra=(), degraded=False):
+    """Responde 304 se o cliente já tem a versão atual, senão serializa build()
+
+    `entries` são as entradas de `src.upstream` das quais o payload depende;
+    `extra` são valores adicionais que também alteram o payload. Como esses
+    valores não se refletem na data dos dados, com `extra` a resposta não
+    envia Last-Modified e If-Modified-Since é ignorado.
+
+    Respostas degradadas (`degraded`, ou alguma entrada servida como dado
+    antigo após falha do upstream) saem com max-age=0 e sem
+    stale-while-revalidate, para não ficarem em caches como se fossem novas.
+    """
+    etag = make_etag(entries, extra)
+    last_modified = None if extra else _last_modified(entries)
+
+    if _not_modified(etag, last_modified):
+        response = make_response('', 304)
+    else:
+        response = jsonify(build())
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    degraded = degraded or any(entry and entry.get('stale') for entry in entries)
+    response.cache_control.public = True
+    response.cache_control.max_age = 0 if degraded else max_age
+    if stale_while_revalidate and not degraded:
+        response.cache_control.stale_while_revalidate = stale_while_revalidate
+    return response
@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+from src import trend
+
+def calculate_sma(prices, window):
+    """Calcula a Média Móvel Simples (SMA)"""
+    return pd.Series(prices).rolling(window=window).mean().tolist()
+
+def calculate_ema(prices, window):
+    """Calcula a Média Móvel Exponencial (EMA)"""
+    return pd.Series(prices).ewm(span=window).mean().tolist()
+
+def calculate_rsi(prices, window=14):
+    """Calcula o Índice de Força Relativa (RSI)"""
+    prices_series = pd.Series(prices)
+    delta = prices_series.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+    rs = gain / loss
+    rsi = 100 - (100 / (1 + rs))
+    return rsi.tolist()
+
+def calculate_bollinger_bands(prices, window=20, num_std=2):
+    """Calcula as Bandas de Bollinger"""
+    prices_series = pd.Series(prices)
+    sma = prices_series.rolling(window=window).mean()
+    std = prices_series.rolling(window=window).std()
+    
+    upper_band = sma + (std * num_std)
+    lower_band = sma - (std * num_std)
+    
+    return {
+        'upper': upper_band.tolist(),
+        'middle': sma.tolist(),
+        'lower': lower_band.tolist()
+    }
+
+def calculate_macd(prices, fast=12, slow=26, signal=9):
+    """Calcula o MACD (Moving Average Convergence Divergence)"""
+    prices_series = pd.Series(prices)
+    ema_fast = prices_series.ewm(span=fast).mean()
+    ema_slow = prices_series.ewm(span=slow).mean()
+    
+    macd_line = ema_fast - ema_slow
+    signal_line = macd_line.ewm(span=signal).mean()
+    histogram = macd_line - signal_line
+    
+    return {
+        'macd': macd_line.tolist(),
+        'signal': signal_line.tolist(),
+        'histogram': histogram.tolist()
+    }
+
+def calculate_stochastic(high_prices, low_prices, close_prices, k_window=14, d_window=3):
+    """Calcula o Oscilador Estocástico"""
+    high_series = pd.Series(high_prices)
+    low_series = pd.Series(low_prices)
+    close_series = pd.Series(close_prices)
+    
+    lowest_low = low_series.rolling(window=k_window).min()
+    highest_high = high_series.rolling(window=k_window).max()
+    
+    k_percent = 100 * ((close_series - lowest_low) / (highest_high - lowest_low))
+    d_percent = k_percent.rolling(window=d_window).mean()
+    
+    return {
+        'k': k_percent.tolist(),
+        'd': d_percent.tolist()
+    }
+
+def detect_support_resistance(prices, window=20):
+    """Detecta níveis de suporte e resistência"""
+    prices_series = pd.Series(prices)
+    
+    # Encontrar máximos e mínimos locais
+    highs = prices_series.rolling(window=window, center=True).max()
+    lows = prices_series.rolling(window=window, center=True).min()
+    
+    resistance_levels = []
+    support_levels = []
+    
+    for i in range(len(prices)):
+        if prices[i] == highs.iloc[i] and not pd.isna(highs.iloc[i]):
+            resistance_levels.append({'index': i, 'price': prices[i]})
+        if prices[i] == lows.iloc[i] and not pd.isna(lows.iloc[i]):
+            support_levels.append({'index': i, 'price': prices[i]})
+    
+    return {
+        'resistance': resistance_levels,
+        'support': support_levels
+    }
+
+def analyze_trend(prices, window=None):
+    """Analisa a tendência dos preços (regressão sobre as últimas `window` observações)"""
+    return trend.latest_trends([prices], window)[0]
+
+def analyze_trend_timeframes(prices):
+    """Tendência atual e séries de tendência para cada timeframe"""
+    series = trend.trend_series(prices)
+    analysis = {'overall_trend': analyze_trend(prices)}
+    for name, timeframe in series.items():
+        analysis[f'{name}_trend'] = timeframe['trend'][-1] if timeframe['trend'] else 'insufficient_data'
+    analysis['timeframes'] = series
+    return analysis
+
+def build_technical_analysis(coin_id, days, data):
+    """Calcula indicadores, níveis, tendências e sinais a partir do histórico"""
+    # Extrair preços
+    prices = [price[1] for price in data['prices']]
+    volumes = [volume[1] for volume in data['total_volumes']]
+    timestamps = [price[0] for price in data['prices']]
+    
+    # Para indicadores que precisam de high/low, usamos aproximações
+    # Em dados reais, você teria OHLC data
+    high_prices = prices  # Simplificação
+    low_prices = prices   # Simplificação
+    
+    # Calcular indicadores técnicos
+    analysis = {
+        'coin_id': coin_id,
+        'period': f"{days} days",
+        'timestamps': timestamps,
+        'prices': prices,
+        'volumes': volumes,
+        'indicators': {
+            'sma_20': calculate_sma(prices, 20),
+            'sma_50': calculate_sma(prices, 50),
+            'ema_12': calculate_ema(prices, 12),
+            'ema_26': calculate_ema(prices, 26),
+            'rsi': calculate_rsi(prices),
+            'bollinger_bands': calculate_bollinger_bands(prices),
+            'macd': calculate_macd(prices),
+            'stochastic': calculate_stochastic(high_prices, low_prices, prices)
+        },
+        'levels': detect_support_resistance(prices),
+        'trend_analysis': analyze_trend_timeframes(prices)
+    }
+    
+    # Adicionar sinais de trading
+    current_rsi = analysis['indicators']['rsi'][-1] if analysis['indicators']['rsi'] else None
+    current_price = prices[-1]
+    sma_20 = analysis['indicators']['sma_20'][-1] if analysis['indicators']['sma_20'] else None
+    sma_50 = analysis['indicators']['sma_50'][-1] if analysis['indicators']['sma_50'] else None
+    
+    signals = []
+    
+    if current_rsi:
+        if current_rsi > 70:
+            signals.append({
+                'type': 'sell',
+                'indicator': 'RSI',
+                'message': f'RSI em {current_rsi:.2f} indica sobrecompra',
+                'strength': 'medium'
+            })
+        elif current_rsi < 30:
+            signals.append({
+                'type': 'buy',
+                'indicator': 'RSI',
+                'message': f'RSI em {current_rsi:.2f} indica sobrevenda',
+                'strength': 'medium'
+            })
+    
+    if sma_20 and sma_50:
+        if current_price > sma_20 > sma_50:
+            signals.append({
+                'type': 'buy',
+                'indicator': 'Moving Averages',
+                'message': 'Preço acima das médias móveis - tendência de alta',
+                'strength': 'strong'
+            })
+        elif current_price < sma_20 < sma_50:
+            signals.append({
+                'type': 'sell',
+                'indicator': 'Moving Averages',
+                'message': 'Preço abaixo das médias móveis - tendência de baixa',
+                'strength': 'strong'
+            })
+    
+    analysis['trading_signals'] = signals
+    
+    return analysis
+
+def calculate_volatility(prices):
+    """Calcula a volatilidade como coeficiente de variação (%)"""
+    return np.std(prices) / np.mean(prices) * 100
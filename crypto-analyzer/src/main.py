@@ -3,46 +3,73 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
+import click
 from flask import Flask, send_from_directory
-from flask_cors import CORS
-from src.models.user import db
-from src.routes.user import user_bp
-from src.routes.crypto import crypto_bp
-from src.routes.technical_analysis import technical_bp
-
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
-app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
-
-# Habilitar CORS para todas as rotas
-CORS(app)
-
-app.register_blueprint(user_bp, url_prefix='/api')
-app.register_blueprint(crypto_bp, url_prefix='/api/crypto')
-app.register_blueprint(technical_bp, url_prefix='/api/technical')
-
-# uncomment if you need to use database
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
-with app.app_context():
-    db.create_all()
-
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
-def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-            return "Static folder not configured", 404
-
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
+
+STATIC_FOLDER = os.path.join(os.path.dirname(__file__), 'static')
+DATABASE_URI = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
+
+def create_app(config=None):
+    """Cria e configura a aplicação Flask
+
+    Blueprints e extensões são importados aqui, e não no import do módulo;
+    pandas/NumPy só são carregados quando uma rota de indicadores é executada.
+    O schema do banco não é criado aqui: use `init_db` ou `flask init-db`.
+    """
+    from flask_cors import CORS
+    from src.models.user import db
+    from src.routes.user import user_bp
+    from src.routes.crypto import crypto_bp
+    from src.routes.technical_analysis import technical_bp
+
+    app = Flask(__name__, static_folder=STATIC_FOLDER)
+    app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
+    app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URI
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    if config:
+        app.config.update(config)
+
+    # Habilitar CORS para todas as rotas
+    CORS(app)
+
+    app.register_blueprint(user_bp, url_prefix='/api')
+    app.register_blueprint(crypto_bp, url_prefix='/api/crypto')
+    app.register_blueprint(technical_bp, url_prefix='/api/technical')
+
+    db.init_app(app)
+
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Cria as tabelas do banco de dados"""
+        init_db(app)
+        click.echo('Banco de dados inicializado')
+
+    @app.route('/', defaults={'path': ''})
+    @app.route('/<path:path>')
+    def serve(path):
+        static_folder_path = app.static_folder
+        if static_folder_path is None:
+                return "Static folder not configured", 404
+
+        if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
+            return send_from_directory(static_folder_path, path)
         else:
-            return "index.html not found", 404
+            index_path = os.path.join(static_folder_path, 'index.html')
+            if os.path.exists(index_path):
+                return send_from_directory(static_folder_path, 'index.html')
+            else:
+                return "index.html not found", 404
+
+    return app
+
+def init_db(app):
+    """Cria o schema do banco de dados (passo explícito de inicialização)"""
+    from src.models.user import db
+    with app.app_context():
+        db.create_all()
 
 
 if __name__ == '__main__':
+    app = create_app()
+    init_db(app)
     app.run(host='0.0.0.0', port=5000, debug=True)
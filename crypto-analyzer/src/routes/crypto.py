@@ -1,22 +1,80 @@
 from flask import Blueprint, jsonify, request
 import requests
 import time
-from datetime import datetime, timedelta
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import datetime, timedelta, timezone
+from src import upstream
+from src.http_cache import cached_json
 
 crypto_bp = Blueprint('crypto', __name__)
 
 # Base URL da API CoinGecko
 COINGECKO_BASE_URL = "https://api.coingecko.com/api/v3"
+FEAR_GREED_URL = "https://api.alternative.me/fng/"
+
+# Versão do formato do payload do dashboard (incrementar quando mudar)
+DASHBOARD_VERSION = 2
+
+# Códigos de erro estáveis das seções do dashboard (entram no payload e no ETag)
+SECTION_TIMEOUT = 'timeout'
+SECTION_UPSTREAM_ERROR = 'upstream_error'
+
+# Seções do dashboard: url, parâmetros, tempo de vida do cache (s) e timeout (s)
+DASHBOARD_SECTIONS = {
+    'markets': {
+        'url': f"{COINGECKO_BASE_URL}/coins/markets",
+        'params': {
+            'vs_currency': 'usd',
+            'order': 'market_cap_desc',
+            'per_page': '50',
+            'page': '1',
+            'sparkline': 'true',
+            'price_change_percentage': '1h,24h,7d,30d'
+        },
+        'ttl': 60,
+        'timeout': 5
+    },
+    'global': {
+        'url': f"{COINGECKO_BASE_URL}/global",
+        'params': None,
+        'ttl': 120,
+        'timeout': 4
+    },
+    'trending': {
+        'url': f"{COINGECKO_BASE_URL}/search/trending",
+        'params': None,
+        'ttl': 300,
+        'timeout': 4
+    },
+    'fear_greed': {
+        'url': FEAR_GREED_URL,
+        'params': None,
+        'ttl': 900,
+        'timeout': 3
+    }
+}
+
+def _section_payload(entry, error=None):
+    """Monta o payload de uma seção do dashboard com informações de atualização"""
+    if entry is None:
+        return {'data': None, 'fetched_at': None, 'error': error}
+    payload = {
+        'data': entry['data'],
+        'fetched_at': datetime.fromtimestamp(entry['fetched_at'], timezone.utc).isoformat()
+    }
+    if error:
+        payload['error'] = error
+        payload['stale'] = True
+    return payload
 
 @crypto_bp.route('/coins/list', methods=['GET'])
 def get_coins_list():
     """Retorna lista de todas as criptomoedas disponíveis"""
     try:
-        response = requests.get(f"{COINGECKO_BASE_URL}/coins/list")
-        if response.status_code == 200:
-            return jsonify(response.json())
-        else:
+        entry = upstream.get(f"{COINGECKO_BASE_URL}/coins/list", ttl=3600)
+        if entry is None:
             return jsonify({"error": "Erro ao buscar lista de moedas"}), 500
+        return cached_json(lambda: entry['data'], [entry], max_age=3600, stale_while_revalidate=86400)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -38,11 +96,10 @@ def get_market_data():
             'price_change_percentage': '1h,24h,7d,30d'
         }
         
-        response = requests.get(f"{COINGECKO_BASE_URL}/coins/markets", params=params)
-        if response.status_code == 200:
-            return jsonify(response.json())
-        else:
+        entry = upstream.get(f"{COINGECKO_BASE_URL}/coins/markets", params=params, ttl=60)
+        if entry is None:
             return jsonify({"error": "Erro ao buscar dados de mercado"}), 500
+        return cached_json(lambda: entry['data'], [entry], max_age=60, stale_while_revalidate=120)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -59,11 +116,10 @@ def get_coin_details(coin_id):
             'sparkline': 'true'
         }
         
-        response = requests.get(f"{COINGECKO_BASE_URL}/coins/{coin_id}", params=params)
-        if response.status_code == 200:
-            return jsonify(response.json())
-        else:
+        entry = upstream.get(f"{COINGECKO_BASE_URL}/coins/{coin_id}", params=params, ttl=60)
+        if entry is None:
             return jsonify({"error": "Erro ao buscar detalhes da moeda"}), 500
+        return cached_json(lambda: entry['data'], [entry], max_age=60, stale_while_revalidate=300)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -81,11 +137,10 @@ def get_coin_history(coin_id):
             'interval': interval
         }
         
-        response = requests.get(f"{COINGECKO_BASE_URL}/coins/{coin_id}/market_chart", params=params)
-        if response.status_code == 200:
-            return jsonify(response.json())
-        else:
+        entry = upstream.get(f"{COINGECKO_BASE_URL}/coins/{coin_id}/market_chart", params=params, ttl=300)
+        if entry is None:
             return jsonify({"error": "Erro ao buscar dados históricos"}), 500
+        return cached_json(lambda: entry['data'], [entry], max_age=300, stale_while_revalidate=900)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -93,11 +148,10 @@ def get_coin_history(coin_id):
 def get_global_data():
     """Retorna dados globais do mercado de criptomoedas"""
     try:
-        response = requests.get(f"{COINGECKO_BASE_URL}/global")
-        if response.status_code == 200:
-            return jsonify(response.json())
-        else:
+        entry = upstream.get(f"{COINGECKO_BASE_URL}/global", ttl=120)
+        if entry is None:
             return jsonify({"error": "Erro ao buscar dados globais"}), 500
+        return cached_json(lambda: entry['data'], [entry], max_age=120, stale_while_revalidate=300)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -105,11 +159,10 @@ def get_global_data():
 def get_trending():
     """Retorna as criptomoedas em tendência"""
     try:
-        response = requests.get(f"{COINGECKO_BASE_URL}/search/trending")
-        if response.status_code == 200:
-            return jsonify(response.json())
-        else:
+        entry = upstream.get(f"{COINGECKO_BASE_URL}/search/trending", ttl=300)
+        if entry is None:
             return jsonify({"error": "Erro ao buscar tendências"}), 500
+        return cached_json(lambda: entry['data'], [entry], max_age=300, stale_while_revalidate=600)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -118,11 +171,64 @@ def get_fear_greed_index():
     """Retorna o índice de medo e ganância"""
     try:
         # API alternativa para Fear & Greed Index
-        response = requests.get("https://api.alternative.me/fng/")
-        if response.status_code == 200:
-            return jsonify(response.json())
-        else:
+        entry = upstream.get(FEAR_GREED_URL, ttl=900)
+        if entry is None:
             return jsonify({"error": "Erro ao buscar índice de medo e ganância"}), 500
+        return cached_json(lambda: entry['data'], [entry], max_age=900, stale_while_revalidate=3600)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@crypto_bp.route('/dashboard', methods=['GET'])
+def get_dashboard():
+    """Retorna todos os dados do dashboard em uma única requisição"""
+    try:
+        sections = {}
+        futures = {}
+        now = time.time()
+
+        # Servir do cache o que ainda está fresco e buscar o resto em paralelo
+        for name, section in DASHBOARD_SECTIONS.items():
+            entry = upstream.get_cached(section['url'], section['params'])
+            if upstream.is_fresh(entry, section['ttl']):
+                sections[name] = (entry, None)
+            else:
+                future = upstream.submit_fetch(section['url'], section['params'], section['timeout'])
+                futures[future] = name
+
+        # Cada seção tem seu próprio timeout; uma fonte lenta não bloqueia as demais
+        deadlines = {future: now + DASHBOARD_SECTIONS[name]['timeout'] for future, name in futures.items()}
+        pending = set(futures)
+        while pending:
+            remaining = min(deadlines[future] for future in pending) - time.time()
+            done, pending = wait(pending, timeout=max(remaining, 0), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                section = DASHBOARD_SECTIONS[name]
+                try:
+                    sections[name] = (future.result(), None)
+                except Exception:
+                    stale = upstream.get_cached(section['url'], section['params'])
+                    sections[name] = (stale, SECTION_UPSTREAM_ERROR)
+
+            # Seções que estouraram o timeout: usar dados antigos do cache, se houver
+            for future in [f for f in pending if deadlines[f] <= time.time()]:
+                pending.discard(future)
+                name = futures[future]
+                section = DASHBOARD_SECTIONS[name]
+                stale = upstream.get_cached(section['url'], section['params'])
+                sections[name] = (stale, SECTION_TIMEOUT)
+
+        names = sorted(sections)
+        return cached_json(
+            lambda: {'sections': {name: _section_payload(*sections[name]) for name in names}},
+            [sections[name][0] for name in names],
+            max_age=60,
+            stale_while_revalidate=120,
+            extra=[f"v{DASHBOARD_VERSION}"] + [f"{name}:{sections[name][1]}" for name in names],
+            # Dashboard parcial não deve ficar em cache: a seção que falhou
+            # pode estar disponível na próxima requisição
+            degraded=any(error for _, error in sections.values())
+        )
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -138,11 +244,10 @@ def get_exchanges():
             'page': page
         }
         
-        response = requests.get(f"{COINGECKO_BASE_URL}/exchanges", params=params)
-        if response.status_code == 200:
-            return jsonify(response.json())
-        else:
+        entry = upstream.get(f"{COINGECKO_BASE_URL}/exchanges", params=params, ttl=300)
+        if entry is None:
             return jsonify({"error": "Erro ao buscar exchanges"}), 500
+        return cached_json(lambda: entry['data'], [entry], max_age=300, stale_while_revalidate=900)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -1,121 +1,19 @@
 from flask import Blueprint, jsonify, request
-import requests
-import numpy as np
-import pandas as pd
 from datetime import datetime, timedelta
+from src import upstream
+from src.http_cache import cached_json
 
 technical_bp = Blueprint('technical', __name__)
 
 # Base URL da API CoinGecko
 COINGECKO_BASE_URL = "https://api.coingecko.com/api/v3"
 
-def calculate_sma(prices, window):
-    """Calcula a Média Móvel Simples (SMA)"""
-    return pd.Series(prices).rolling(window=window).mean().tolist()
-
-def calculate_ema(prices, window):
-    """Calcula a Média Móvel Exponencial (EMA)"""
-    return pd.Series(prices).ewm(span=window).mean().tolist()
-
-def calculate_rsi(prices, window=14):
-    """Calcula o Índice de Força Relativa (RSI)"""
-    prices_series = pd.Series(prices)
-    delta = prices_series.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi.tolist()
-
-def calculate_bollinger_bands(prices, window=20, num_std=2):
-    """Calcula as Bandas de Bollinger"""
-    prices_series = pd.Series(prices)
-    sma = prices_series.rolling(window=window).mean()
-    std = prices_series.rolling(window=window).std()
-    
-    upper_band = sma + (std * num_std)
-    lower_band = sma - (std * num_std)
-    
-    return {
-        'upper': upper_band.tolist(),
-        'middle': sma.tolist(),
-        'lower': lower_band.tolist()
-    }
-
-def calculate_macd(prices, fast=12, slow=26, signal=9):
-    """Calcula o MACD (Moving Average Convergence Divergence)"""
-    prices_series = pd.Series(prices)
-    ema_fast = prices_series.ewm(span=fast).mean()
-    ema_slow = prices_series.ewm(span=slow).mean()
-    
-    macd_line = ema_fast - ema_slow
-    signal_line = macd_line.ewm(span=signal).mean()
-    histogram = macd_line - signal_line
-    
-    return {
-        'macd': macd_line.tolist(),
-        'signal': signal_line.tolist(),
-        'histogram': histogram.tolist()
-    }
-
-def calculate_stochastic(high_prices, low_prices, close_prices, k_window=14, d_window=3):
-    """Calcula o Oscilador Estocástico"""
-    high_series = pd.Series(high_prices)
-    low_series = pd.Series(low_prices)
-    close_series = pd.Series(close_prices)
-    
-    lowest_low = low_series.rolling(window=k_window).min()
-    highest_high = high_series.rolling(window=k_window).max()
-    
-    k_percent = 100 * ((close_series - lowest_low) / (highest_high - lowest_low))
-    d_percent = k_percent.rolling(window=d_window).mean()
-    
-    return {
-        'k': k_percent.tolist(),
-        'd': d_percent.tolist()
-    }
-
-def detect_support_resistance(prices, window=20):
-    """Detecta níveis de suporte e resistência"""
-    prices_series = pd.Series(prices)
-    
-    # Encontrar máximos e mínimos locais
-    highs = prices_series.rolling(window=window, center=True).max()
-    lows = prices_series.rolling(window=window, center=True).min()
-    
-    resistance_levels = []
-    support_levels = []
-    
-    for i in range(len(prices)):
-        if prices[i] == highs.iloc[i] and not pd.isna(highs.iloc[i]):
-            resistance_levels.append({'index': i, 'price': prices[i]})
-        if prices[i] == lows.iloc[i] and not pd.isna(lows.iloc[i]):
-            support_levels.append({'index': i, 'price': prices[i]})
-    
-    return {
-        'resistance': resistance_levels,
-        'support': support_levels
-    }
-
-def analyze_trend(prices):
-    """Analisa a tendência dos preços"""
-    if len(prices) < 2:
-        return 'insufficient_data'
-    
-    # Calcular a inclinação da linha de tendência
-    x = np.arange(len(prices))
-    y = np.array(prices)
-    
-    # Regressão linear simples
-    slope = np.polyfit(x, y, 1)[0]
-    
-    # Determinar tendência
-    if slope > 0.01:
-        return 'bullish'
-    elif slope < -0.01:
-        return 'bearish'
-    else:
-        return 'sideways'
+# Versões do formato dos payloads calculados (incrementar quando a saída mudar)
+PAYLOAD_VERSIONS = {
+    'analyze': 2,
+    'indicators': 2,
+    'screener': 2
+}
 
 @technical_bp.route('/analyze/<coin_id>', methods=['GET'])
 def technical_analysis(coin_id):
@@ -132,90 +30,17 @@ def technical_analysis(coin_id):
             'interval': 'daily'
         }
         
-        response = requests.get(f"{COINGECKO_BASE_URL}/coins/{coin_id}/market_chart", params=params)
-        if response.status_code != 200:
+        entry = upstream.get(f"{COINGECKO_BASE_URL}/coins/{coin_id}/market_chart", params=params, ttl=300)
+        if entry is None:
             return jsonify({"error": "Erro ao buscar dados históricos"}), 500
         
-        data = response.json()
-        
-        # Extrair preços
-        prices = [price[1] for price in data['prices']]
-        volumes = [volume[1] for volume in data['total_volumes']]
-        timestamps = [price[0] for price in data['prices']]
-        
-        # Para indicadores que precisam de high/low, usamos aproximações
-        # Em dados reais, você teria OHLC data
-        high_prices = prices  # Simplificação
-        low_prices = prices   # Simplificação
+        def build():
+            # pandas/NumPy só são importados quando um indicador precisa ser calculado
+            from src import indicators
+            return indicators.build_technical_analysis(coin_id, days, entry['data'])
         
-        # Calcular indicadores técnicos
-        analysis = {
-            'coin_id': coin_id,
-            'period': f"{days} days",
-            'timestamps': timestamps,
-            'prices': prices,
-            'volumes': volumes,
-            'indicators': {
-                'sma_20': calculate_sma(prices, 20),
-                'sma_50': calculate_sma(prices, 50),
-                'ema_12': calculate_ema(prices, 12),
-                'ema_26': calculate_ema(prices, 26),
-                'rsi': calculate_rsi(prices),
-                'bollinger_bands': calculate_bollinger_bands(prices),
-                'macd': calculate_macd(prices),
-                'stochastic': calculate_stochastic(high_prices, low_prices, prices)
-            },
-            'levels': detect_support_resistance(prices),
-            'trend_analysis': {
-                'overall_trend': analyze_trend(prices),
-                'short_term_trend': analyze_trend(prices[-14:]) if len(prices) >= 14 else 'insufficient_data',
-                'medium_term_trend': analyze_trend(prices[-30:]) if len(prices) >= 30 else 'insufficient_data'
-            }
-        }
-        
-        # Adicionar sinais de trading
-        current_rsi = analysis['indicators']['rsi'][-1] if analysis['indicators']['rsi'] else None
-        current_price = prices[-1]
-        sma_20 = analysis['indicators']['sma_20'][-1] if analysis['indicators']['sma_20'] else None
-        sma_50 = analysis['indicators']['sma_50'][-1] if analysis['indicators']['sma_50'] else None
-        
-        signals = []
-        
-        if current_rsi:
-            if current_rsi > 70:
-                signals.append({
-                    'type': 'sell',
-                    'indicator': 'RSI',
-                    'message': f'RSI em {current_rsi:.2f} indica sobrecompra',
-                    'strength': 'medium'
-                })
-            elif current_rsi < 30:
-                signals.append({
-                    'type': 'buy',
-                    'indicator': 'RSI',
-                    'message': f'RSI em {current_rsi:.2f} indica sobrevenda',
-                    'strength': 'medium'
-                })
-        
-        if sma_20 and sma_50:
-            if current_price > sma_20 > sma_50:
-                signals.append({
-                    'type': 'buy',
-                    'indicator': 'Moving Averages',
-                    'message': 'Preço acima das médias móveis - tendência de alta',
-                    'strength': 'strong'
-                })
-            elif current_price < sma_20 < sma_50:
-                signals.append({
-                    'type': 'sell',
-                    'indicator': 'Moving Averages',
-                    'message': 'Preço abaixo das médias móveis - tendência de baixa',
-                    'strength': 'strong'
-                })
-        
-        analysis['trading_signals'] = signals
-        
-        return jsonify(analysis)
+        return cached_json(build, [entry], max_age=300, stale_while_revalidate=900,
+                           extra=[f"v{PAYLOAD_VERSIONS['analyze']}"])
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -233,22 +58,23 @@ def get_indicators(coin_id):
             'interval': 'daily'
         }
         
-        response = requests.get(f"{COINGECKO_BASE_URL}/coins/{coin_id}/market_chart", params=params)
-        if response.status_code != 200:
+        entry = upstream.get(f"{COINGECKO_BASE_URL}/coins/{coin_id}/market_chart", params=params, ttl=300)
+        if entry is None:
             return jsonify({"error": "Erro ao buscar dados históricos"}), 500
         
-        data = response.json()
-        prices = [price[1] for price in data['prices']]
-        
-        indicators = {
-            'current_price': prices[-1],
-            'sma_20': calculate_sma(prices, 20)[-1] if len(prices) >= 20 else None,
-            'ema_12': calculate_ema(prices, 12)[-1] if len(prices) >= 12 else None,
-            'rsi': calculate_rsi(prices)[-1] if len(prices) >= 14 else None,
-            'trend': analyze_trend(prices)
-        }
+        def build():
+            from src import indicators
+            prices = [price[1] for price in entry['data']['prices']]
+            return {
+                'current_price': prices[-1],
+                'sma_20': indicators.calculate_sma(prices, 20)[-1] if len(prices) >= 20 else None,
+                'ema_12': indicators.calculate_ema(prices, 12)[-1] if len(prices) >= 12 else None,
+                'rsi': indicators.calculate_rsi(prices)[-1] if len(prices) >= 14 else None,
+                'trend': indicators.analyze_trend(prices)
+            }
         
-        return jsonify(indicators)
+        return cached_json(build, [entry], max_age=300, stale_while_revalidate=900,
+                           extra=[f"v{PAYLOAD_VERSIONS['indicators']}"])
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -264,27 +90,34 @@ def compare_coins():
         if not coin_ids:
             return jsonify({"error": "Lista de moedas não fornecida"}), 400
         
+        from src import indicators, trend
+        
         comparison = {}
+        coin_prices = {}
         
         for coin_id in coin_ids:
             params = {
                 'vs_currency': 'usd',
-                'days': days,
+                'days': str(days),  # mesma chave de cache das rotas GET
                 'interval': 'daily'
             }
             
-            response = requests.get(f"{COINGECKO_BASE_URL}/coins/{coin_id}/market_chart", params=params)
-            if response.status_code == 200:
-                coin_data = response.json()
-                prices = [price[1] for price in coin_data['prices']]
+            entry = upstream.get(f"{COINGECKO_BASE_URL}/coins/{coin_id}/market_chart", params=params, ttl=300)
+            if entry is not None:
+                prices = [price[1] for price in entry['data']['prices']]
                 
                 comparison[coin_id] = {
                     'current_price': prices[-1],
                     'price_change': ((prices[-1] - prices[0]) / prices[0]) * 100,
-                    'rsi': calculate_rsi(prices)[-1] if len(prices) >= 14 else None,
-                    'trend': analyze_trend(prices),
-                    'volatility': np.std(prices) / np.mean(prices) * 100  # Coeficiente de variação
+                    'rsi': indicators.calculate_rsi(prices)[-1] if len(prices) >= 14 else None,
+                    'volatility': indicators.calculate_volatility(prices)
                 }
+                coin_prices[coin_id] = prices
+        
+        # Tendência de todas as moedas calculada em um único passo vetorizado
+        trends = trend.latest_trends(list(coin_prices.values()))
+        for coin_id, coin_trend in zip(coin_prices, trends):
+            comparison[coin_id]['trend'] = coin_trend
         
         return jsonify(comparison)
         
@@ -296,19 +129,19 @@ def crypto_screener():
     """Screener de criptomoedas baseado em critérios técnicos"""
     try:
         # Buscar top 100 moedas
-        response = requests.get(f"{COINGECKO_BASE_URL}/coins/markets", params={
+        market_entry = upstream.get(f"{COINGECKO_BASE_URL}/coins/markets", params={
             'vs_currency': 'usd',
             'order': 'market_cap_desc',
             'per_page': '100',
             'page': '1',
             'sparkline': 'false',
             'price_change_percentage': '24h,7d,30d'
-        })
+        }, ttl=60)
         
-        if response.status_code != 200:
+        if market_entry is None:
             return jsonify({"error": "Erro ao buscar dados de mercado"}), 500
         
-        market_data = response.json()
+        market_data = market_entry['data']
         
         # Filtros
         min_volume = float(request.args.get('min_volume', '1000000'))  # $1M
@@ -316,7 +149,8 @@ def crypto_screener():
         min_rsi = float(request.args.get('min_rsi', '30'))
         trend_filter = request.args.get('trend', 'all')  # all, bullish, bearish
         
-        screened_coins = []
+        candidates = []
+        failed = False
         
         for coin in market_data:
             # Filtro de volume
@@ -325,25 +159,38 @@ def crypto_screener():
             
             # Buscar dados históricos para RSI
             try:
-                hist_response = requests.get(f"{COINGECKO_BASE_URL}/coins/{coin['id']}/market_chart", params={
+                hist_entry = upstream.get(f"{COINGECKO_BASE_URL}/coins/{coin['id']}/market_chart", params={
                     'vs_currency': 'usd',
                     'days': '30',
                     'interval': 'daily'
-                })
-                
-                if hist_response.status_code == 200:
-                    hist_data = hist_response.json()
-                    prices = [price[1] for price in hist_data['prices']]
-                    
+                }, ttl=300)
+            except:
+                failed = True
+                continue  # Pular moedas com erro
+            
+            if hist_entry is not None:
+                candidates.append((coin, hist_entry))
+            else:
+                failed = True
+        
+        def build():
+            from src import indicators, trend
+            screened_coins = []
+            
+            # Tendência de todas as moedas calculada em um único passo vetorizado
+            all_prices = [[price[1] for price in hist_entry['data'].get('prices', [])] for _, hist_entry in candidates]
+            trends = trend.latest_trends(all_prices)
+            
+            for (coin, _), prices, coin_trend in zip(candidates, all_prices, trends):
+                try:
                     if len(prices) >= 14:
-                        rsi = calculate_rsi(prices)[-1]
-                        trend = analyze_trend(prices)
+                        rsi = indicators.calculate_rsi(prices)[-1]
                         
                         # Aplicar filtros
                         if rsi < min_rsi or rsi > max_rsi:
                             continue
                         
-                        if trend_filter != 'all' and trend != trend_filter:
+                        if trend_filter != 'all' and coin_trend != trend_filter:
                             continue
                         
                         screened_coins.append({
@@ -355,24 +202,32 @@ def crypto_screener():
                             'volume': coin['total_volume'],
                             'market_cap': coin['market_cap'],
                             'rsi': rsi,
-                            'trend': trend
+                            'trend': coin_trend
                         })
-            except:
-                continue  # Pular moedas com erro
-        
-        # Ordenar por volume
-        screened_coins.sort(key=lambda x: x['volume'], reverse=True)
+                except:
+                    continue  # Pular moedas com erro
+            
+            # Ordenar por volume
+            screened_coins.sort(key=lambda x: x['volume'], reverse=True)
+            
+            return {
+                'total_screened': len(screened_coins),
+                'filters_applied': {
+                    'min_volume': min_volume,
+                    'rsi_range': [min_rsi, max_rsi],
+                    'trend': trend_filter
+                },
+                'coins': screened_coins[:50]  # Limitar a 50 resultados
+            }
         
-        return jsonify({
-            'total_screened': len(screened_coins),
-            'filters_applied': {
-                'min_volume': min_volume,
-                'rsi_range': [min_rsi, max_rsi],
-                'trend': trend_filter
-            },
-            'coins': screened_coins[:50]  # Limitar a 50 resultados
-        })
+        return cached_json(
+            build,
+            [market_entry] + [hist_entry for _, hist_entry in candidates],
+            max_age=300,
+            stale_while_revalidate=600,
+            extra=[f"v{PAYLOAD_VERSIONS['screener']}"] + [coin['id'] for coin, _ in candidates],
+            degraded=failed
+        )
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-
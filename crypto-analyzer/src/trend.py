@@ -0,0 +1,124 @@
+"""Regressão linear móvel em forma fechada para análise de tendência
+
+Para cada janela, inclinação, R² e canal de regressão são obtidos a partir de
+somas acumuladas (Σy, Σky, Σy²), em O(n) por série e vetorizado sobre várias
+moedas (arrays 2D: moedas x tempo). A inclinação é normalizada pelo preço
+médio da janela (variação relativa por período), então os mesmos limiares
+valem para moedas de $0.0001 e de $60.000.
+"""
+import numpy as np
+
+# Inclinação normalizada mínima (por período) para considerar alta/baixa: 0.1%
+TREND_THRESHOLD = 0.001
+
+# Janelas padrão da análise multi-timeframe (períodos)
+DEFAULT_WINDOWS = {'short_term': 14, 'medium_term': 30}
+
+
+def _window_sums(values, window):
+    """Somas móveis de `values` em janelas de tamanho `window` ao longo do último eixo"""
+    cumsum = np.cumsum(values, axis=-1)
+    zeros = np.zeros(cumsum.shape[:-1] + (1,))
+    cumsum = np.concatenate([zeros, cumsum], axis=-1)
+    return cumsum[..., window:] - cumsum[..., :-window]
+
+
+def rolling_regression(prices, window, num_std=2):
+    """Regressão linear móvel de `prices` (1D ou 2D moedas x tempo)
+
+    Retorna um dict de arrays com o mesmo formato de `prices`, com NaN nos
+    primeiros `window - 1` pontos:
+    slope (variação relativa por período), r2, e o canal de regressão
+    (middle, upper, lower) avaliado no último ponto de cada janela.
+    """
+    prices = np.asarray(prices, dtype=float)
+    n = prices.shape[-1]
+    result = {key: np.full(prices.shape, np.nan) for key in ('slope', 'r2', 'middle', 'upper', 'lower')}
+    if window < 2 or n < window:
+        return result
+
+    # Escalar cada série pela sua média e centralizar, para evitar perda de
+    # precisão nas somas de quadrados com preços altos
+    scale = prices.mean(axis=-1, keepdims=True)
+    scale = np.where(scale == 0, 1, scale)
+    y = prices / scale - 1
+    k = np.arange(n, dtype=float)
+
+    sum_y = _window_sums(y, window)
+    sum_ky = _window_sums(k * y, window)
+    sum_yy = _window_sums(y * y, window)
+
+    # x = 0..window-1 dentro de cada janela: Σxy = Σky - início * Σy
+    start = np.arange(n - window + 1, dtype=float)
+    sum_xy = sum_ky - start * sum_y
+    sum_x = window * (window - 1) / 2
+    sxx = window * (window * window - 1) / 12  # Σ(x - x̄)²
+
+    sxy = sum_xy - sum_x * sum_y / window
+    syy = np.maximum(sum_yy - sum_y * sum_y / window, 0)
+
+    slope = sxy / sxx
+    mean_y = sum_y / window
+    fitted_end = mean_y + slope * (window - 1) / 2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r2 = np.where(syy > 0, sxy * sxy / (sxx * syy), 1.0)
+        residual_std = np.sqrt(np.maximum(syy - slope * sxy, 0) / max(window - 2, 1))
+        normalized_slope = slope / (mean_y + 1)
+
+    tail = (Ellipsis, slice(window - 1, None))
+    result['slope'][tail] = normalized_slope
+    result['r2'][tail] = np.clip(r2, 0, 1)
+    result['middle'][tail] = scale * (fitted_end + 1)
+    result['upper'][tail] = scale * (fitted_end + num_std * residual_std + 1)
+    result['lower'][tail] = scale * (fitted_end - num_std * residual_std + 1)
+    return result
+
+
+def classify(slopes, threshold=TREND_THRESHOLD):
+    """Classifica inclinações normalizadas em bullish/bearish/sideways"""
+    slopes = np.asarray(slopes, dtype=float)
+    labels = np.where(slopes > threshold, 'bullish', np.where(slopes < -threshold, 'bearish', 'sideways'))
+    return np.where(np.isnan(slopes), 'insufficient_data', labels).astype(object)
+
+
+def latest_trends(price_lists, window=None, threshold=TREND_THRESHOLD):
+    """Classifica a tendência atual de várias moedas de uma vez
+
+    Séries com o mesmo tamanho são empilhadas e calculadas em um único passo.
+    Sem `window`, a regressão usa o histórico completo de cada série.
+    """
+    labels = ['insufficient_data'] * len(price_lists)
+    by_length = {}
+    for i, prices in enumerate(price_lists):
+        by_length.setdefault(len(prices), []).append(i)
+
+    for length, indexes in by_length.items():
+        size = window or length
+        if length < max(size, 2):
+            continue
+        matrix = np.array([price_lists[i][-size:] for i in indexes], dtype=float)
+        slopes = rolling_regression(matrix, size)['slope'][:, -1]
+        for i, label in zip(indexes, classify(slopes, threshold)):
+            labels[i] = label
+    return labels
+
+
+def trend_series(prices, windows=None, num_std=2, threshold=TREND_THRESHOLD):
+    """Série completa de tendência para cada janela (multi-timeframe)"""
+    windows = windows or DEFAULT_WINDOWS
+    series = {}
+    for name, window in windows.items():
+        regression = rolling_regression(prices, window, num_std)
+        series[name] = {
+            'window': window,
+            'slope': regression['slope'].tolist(),
+            'r2': regression['r2'].tolist(),
+            'trend': classify(regression['slope'], threshold).tolist(),
+            'channel': {
+                'upper': regression['upper'].tolist(),
+                'middle': regression['middle'].tolist(),
+                'lower': regression['lower'].tolist()
+            }
+        }
+    return series
@@ -0,0 +1,123 @@
+"""Cache em memória das respostas das APIs externas (CoinGecko, alternative.me)
+
+Cada entrada guarda os dados decodificados, o momento da busca e uma versão
+(hash do corpo recebido do upstream), usada para gerar ETags sem precisar
+serializar a resposta da API novamente.
+
+O cache é um LRU limitado a MAX_ENTRIES chaves; entradas mais antigas que
+MAX_STALE segundos são descartadas e nunca servidas.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+DEFAULT_TTL = 60
+
+# Limites do cache: número máximo de chaves e idade máxima de dados antigos (s)
+MAX_ENTRIES = 512
+MAX_STALE = 6 * 3600
+
+# chave -> {'data': ..., 'fetched_at': ..., 'version': ...}, em ordem de uso (LRU)
+_cache = OrderedDict()
+_cache_lock = threading.RLock()
+
+# Pool compartilhado para buscas em paralelo e buscas em andamento por chave
+_executor = ThreadPoolExecutor(max_workers=8)
+_inflight = {}
+
+
+def cache_key(url, params=None):
+    return (url, tuple(sorted((params or {}).items())))
+
+
+def get_cached(url, params=None):
+    """Retorna a entrada do cache (mesmo que expirada, até MAX_STALE), ou None"""
+    key = cache_key(url, params)
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry['fetched_at'] > MAX_STALE:
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return entry
+
+
+def _store(url, params, response):
+    entry = {
+        'data': response.json(),
+        'fetched_at': time.time(),
+        'version': hashlib.blake2b(response.content, digest_size=16).hexdigest()
+    }
+    key = cache_key(url, params)
+    with _cache_lock:
+        _cache[key] = entry
+        _cache.move_to_end(key)
+
+        # Descartar entradas além do horizonte de dados antigos e, depois, as menos usadas
+        horizon = entry['fetched_at'] - MAX_STALE
+        for expired in [k for k, e in _cache.items() if e['fetched_at'] < horizon]:
+            del _cache[expired]
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return entry
+
+
+def fetch(url, params=None, timeout=None):
+    """Busca um recurso upstream e grava no cache; levanta exceção em caso de erro"""
+    response = requests.get(url, params=params, timeout=timeout)
+    response.raise_for_status()
+    return _store(url, params, response)
+
+
+def get(url, params=None, ttl=DEFAULT_TTL, timeout=None):
+    """Retorna a entrada do cache se ainda estiver fresca, senão busca no upstream
+
+    Se o upstream falhar (ex.: 429), retorna uma cópia da entrada antiga do
+    cache marcada com 'stale': True, se houver; sem ela, retorna None para
+    status diferente de 200.
+    """
+    entry = get_cached(url, params)
+    if is_fresh(entry, ttl):
+        return entry
+
+    try:
+        response = requests.get(url, params=params, timeout=timeout)
+    except requests.RequestException:
+        if entry is not None:
+            return _stale(entry)
+        raise
+    if response.status_code != 200:
+        return _stale(entry)
+    return _store(url, params, response)
+
+
+def _stale(entry):
+    return None if entry is None else dict(entry, stale=True)
+
+
+def is_fresh(entry, ttl):
+    return entry is not None and time.time() - entry['fetched_at'] < ttl
+
+
+def submit_fetch(url, params=None, timeout=None):
+    """Agenda a busca de um recurso upstream, reaproveitando uma busca em andamento"""
+    key = cache_key(url, params)
+    with _cache_lock:
+        future = _inflight.get(key)
+        if future is None or future.done():
+            future = _executor.submit(fetch, url, params, timeout)
+            _inflight[key] = future
+            future.add_done_callback(lambda done: _discard_inflight(key, done))
+        return future
+
+
+def _discard_inflight(key, future):
+    with _cache_lock:
+        if _inflight.get(key) is future:
+            del _inflight[key]
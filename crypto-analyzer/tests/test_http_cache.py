@@ -0,0 +1,108 @@
+"""Respostas condicionais (ETag/Last-Modified/304) e cabeçalhos de cache"""
+import time
+from unittest import mock
+
+import pytest
+from flask import Flask
+
+from src.http_cache import cached_json
+
+ENTRY = {'data': {'a': 1}, 'fetched_at': time.time() - 60, 'version': 'v1'}
+FUTURE = 'Mon, 01 Jan 2100 00:00:00 GMT'
+PAST = 'Mon, 01 Jan 2001 00:00:00 GMT'
+
+
+@pytest.fixture
+def build():
+    return mock.Mock(return_value={'a': 1})
+
+
+@pytest.fixture
+def client(build):
+    app = Flask(__name__)
+    state = {'entries': [ENTRY], 'extra': (), 'degraded': False}
+
+    @app.route('/data')
+    def data():
+        return cached_json(build, state['entries'], max_age=60, stale_while_revalidate=120,
+                           extra=state['extra'], degraded=state['degraded'])
+
+    client = app.test_client()
+    client.state = state
+    return client
+
+
+def test_first_request_builds_payload_with_cache_headers(client, build):
+    response = client.get('/data')
+
+    assert response.status_code == 200
+    assert response.json == {'a': 1}
+    assert build.call_count == 1
+    assert response.headers['ETag']
+    assert response.headers['Last-Modified']
+    assert response.cache_control.max_age == 60
+    assert response.cache_control.stale_while_revalidate == 120
+
+
+def test_if_none_match_returns_304_without_building(client, build):
+    etag = client.get('/data').headers['ETag']
+    build.reset_mock()
+
+    response = client.get('/data', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+    build.assert_not_called()
+
+
+def test_etag_depends_on_query_args_and_data_version(client):
+    etag = client.get('/data').headers['ETag']
+
+    assert client.get('/data?page=2').headers['ETag'] != etag
+    client.state['entries'] = [dict(ENTRY, version='v2')]
+    assert client.get('/data').headers['ETag'] != etag
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since(client, build):
+    response = client.get('/data', headers={'If-None-Match': '"other"', 'If-Modified-Since': FUTURE})
+
+    assert response.status_code == 200
+    assert build.call_count == 1
+
+
+def test_if_modified_since_returns_304_without_extra(client, build):
+    assert client.get('/data', headers={'If-Modified-Since': FUTURE}).status_code == 304
+    assert client.get('/data', headers={'If-Modified-Since': PAST}).status_code == 200
+    assert build.call_count == 1
+
+
+def test_extra_suppresses_last_modified_and_if_modified_since(client, build):
+    client.state['extra'] = ['v1']
+
+    response = client.get('/data', headers={'If-Modified-Since': FUTURE})
+
+    assert response.status_code == 200
+    assert 'Last-Modified' not in response.headers
+    assert build.call_count == 1
+
+
+def test_extra_changes_etag(client):
+    etag = client.get('/data').headers['ETag']
+    client.state['extra'] = ['v2']
+
+    assert client.get('/data').headers['ETag'] != etag
+
+
+@pytest.mark.parametrize('state', [
+    {'entries': [dict(ENTRY, stale=True)]},
+    {'degraded': True},
+])
+def test_degraded_responses_are_not_cached(client, state):
+    client.state.update(state)
+
+    response = client.get('/data')
+
+    assert response.status_code == 200
+    assert response.cache_control.max_age == 0
+    assert response.cache_control.stale_while_revalidate is None
@@ -0,0 +1,66 @@
+"""Orçamento de tempo de inicialização e carregamento preguiçoso do pandas
+
+Cada verificação roda em um subprocesso novo, para medir o import a frio e
+não herdar módulos já carregados por outros testes.
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Tempo máximo (s) para `import src.main` + `create_app()` em um processo novo
+STARTUP_BUDGET = 1.5
+
+
+def run_snippet(code):
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_create_app_within_import_budget():
+    result = run_snippet('''
+import json, sys, time
+start = time.perf_counter()
+import src.main
+src.main.create_app()
+elapsed = time.perf_counter() - start
+print(json.dumps({'elapsed': elapsed, 'pandas': 'pandas' in sys.modules, 'numpy': 'numpy' in sys.modules}))
+''')
+
+    assert result['elapsed'] < STARTUP_BUDGET
+    assert not result['pandas']
+    assert not result['numpy']
+
+
+def test_crypto_routes_do_not_import_pandas():
+    result = run_snippet('''
+import json, sys
+from unittest import mock
+from src.main import create_app
+
+class FakeResponse:
+    status_code = 200
+    content = b'{"data": []}'
+    def json(self):
+        return {'data': []}
+    def raise_for_status(self):
+        pass
+
+app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+client = app.test_client()
+with mock.patch('requests.get', return_value=FakeResponse()):
+    statuses = [client.get(path).status_code for path in ('/api/crypto/global', '/api/crypto/dashboard')]
+print(json.dumps({'statuses': statuses, 'pandas': 'pandas' in sys.modules, 'numpy': 'numpy' in sys.modules}))
+''')
+
+    assert result['statuses'] == [200, 200]
+    assert not result['pandas']
+    assert not result['numpy']
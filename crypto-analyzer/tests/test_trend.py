@@ -0,0 +1,86 @@
+"""Regressão móvel em forma fechada comparada com np.polyfit"""
+import numpy as np
+import pytest
+
+from src import trend
+
+
+def random_walk(start, n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return start * np.cumprod(1 + rng.normal(0, 0.02, n))
+
+
+def polyfit_window(segment, num_std=2):
+    x = np.arange(len(segment))
+    slope, intercept = np.polyfit(x, segment, 1)
+    fitted = intercept + slope * x
+    residual_ss = ((segment - fitted) ** 2).sum()
+    r2 = 1 - residual_ss / ((segment - segment.mean()) ** 2).sum()
+    residual_std = np.sqrt(residual_ss / (len(segment) - 2))
+    return {
+        'slope': slope / segment.mean(),
+        'r2': r2,
+        'middle': fitted[-1],
+        'upper': fitted[-1] + num_std * residual_std,
+        'lower': fitted[-1] - num_std * residual_std
+    }
+
+
+@pytest.mark.parametrize('start', [1e-4, 1.0, 6e4, 1e9])
+@pytest.mark.parametrize('window', [14, 30])
+def test_rolling_regression_matches_polyfit(start, window):
+    prices = random_walk(start)
+    regression = trend.rolling_regression(prices, window)
+
+    for end in (window - 1, 100, len(prices) - 1):
+        expected = polyfit_window(prices[end - window + 1:end + 1])
+        for key, value in expected.items():
+            assert regression[key][end] == pytest.approx(value, rel=1e-8, abs=1e-12 * start)
+
+
+def test_rolling_regression_vectorized_matches_single_series():
+    prices = np.vstack([random_walk(6e4, seed=1), random_walk(1e-4, seed=2)])
+    matrix = trend.rolling_regression(prices, 30)
+
+    for row in range(2):
+        single = trend.rolling_regression(prices[row], 30)
+        for key in single:
+            np.testing.assert_allclose(matrix[key][row], single[key], rtol=1e-12)
+
+
+def test_rolling_regression_leading_points_are_nan():
+    regression = trend.rolling_regression(random_walk(100.0, n=40), 14)
+
+    assert np.isnan(regression['slope'][:13]).all()
+    assert not np.isnan(regression['slope'][13:]).any()
+
+
+def test_rolling_regression_window_larger_than_series():
+    regression = trend.rolling_regression([1.0, 2.0, 3.0], 14)
+
+    for values in regression.values():
+        assert values.shape == (3,)
+        assert np.isnan(values).all()
+
+
+def test_latest_trends_classification_is_scale_independent():
+    up = list(np.linspace(100, 130, 30))
+    tiny_up = [price * 1e-8 for price in up]
+    down = up[::-1]
+    flat = [5.0] * 30
+
+    assert trend.latest_trends([up, tiny_up, down, flat]) == ['bullish', 'bullish', 'bearish', 'sideways']
+
+
+def test_latest_trends_insufficient_data():
+    assert trend.latest_trends([[1.0], [], [1.0, 2.0, 3.0]], window=14) == [
+        'insufficient_data', 'insufficient_data', 'insufficient_data'
+    ]
+
+
+def test_trend_series_marks_insufficient_data():
+    series = trend.trend_series(list(np.linspace(1, 2, 20)))
+
+    assert series['short_term']['trend'][:13] == ['insufficient_data'] * 13
+    assert series['short_term']['trend'][-1] == 'bullish'
+    assert series['medium_term']['trend'] == ['insufficient_data'] * 20
@@ -0,0 +1,141 @@
+"""Cache de respostas upstream: TTL, fallback para dados antigos e limites"""
+import json
+import time
+from unittest import mock
+
+import pytest
+import requests
+
+from src import upstream
+
+URL = 'https://api.example.com/global'
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+        self.content = json.dumps(data).encode()
+
+    def json(self):
+        return self.data
+
+    def raise_for_status(self):
+        if self.status_code != 200:
+            raise requests.HTTPError(str(self.status_code))
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    upstream._cache.clear()
+    yield
+    upstream._cache.clear()
+
+
+def expire(url=URL, params=None, age=3600):
+    upstream._cache[upstream.cache_key(url, params)]['fetched_at'] -= age
+
+
+def test_get_serves_fresh_entry_from_cache():
+    with mock.patch('requests.get', return_value=FakeResponse({'a': 1})) as get:
+        first = upstream.get(URL, ttl=60)
+        second = upstream.get(URL, ttl=60)
+
+    assert get.call_count == 1
+    assert second is first
+    assert 'stale' not in second
+
+
+def test_get_refetches_expired_entry():
+    with mock.patch('requests.get', return_value=FakeResponse({'a': 1})):
+        upstream.get(URL, ttl=60)
+    expire(age=120)
+
+    with mock.patch('requests.get', return_value=FakeResponse({'a': 2})) as get:
+        entry = upstream.get(URL, ttl=60)
+
+    assert get.call_count == 1
+    assert entry['data'] == {'a': 2}
+
+
+def test_get_returns_stale_entry_on_non_200():
+    with mock.patch('requests.get', return_value=FakeResponse({'a': 1})):
+        upstream.get(URL, ttl=60)
+    expire(age=120)
+
+    with mock.patch('requests.get', return_value=FakeResponse({}, 429)):
+        entry = upstream.get(URL, ttl=60)
+
+    assert entry['data'] == {'a': 1}
+    assert entry['stale'] is True
+    # O flag vale só para esta resposta, não para a entrada do cache
+    assert 'stale' not in upstream.get_cached(URL)
+
+
+def test_get_returns_stale_entry_on_request_exception():
+    with mock.patch('requests.get', return_value=FakeResponse({'a': 1})):
+        upstream.get(URL, ttl=60)
+    expire(age=120)
+
+    with mock.patch('requests.get', side_effect=requests.ConnectionError('down')):
+        entry = upstream.get(URL, ttl=60)
+
+    assert entry['data'] == {'a': 1}
+    assert entry['stale'] is True
+
+
+def test_get_without_cached_entry_returns_none_on_non_200():
+    with mock.patch('requests.get', return_value=FakeResponse({}, 429)):
+        assert upstream.get(URL) is None
+
+
+def test_get_without_cached_entry_raises_on_request_exception():
+    with mock.patch('requests.get', side_effect=requests.ConnectionError('down')):
+        with pytest.raises(requests.ConnectionError):
+            upstream.get(URL)
+
+
+def test_cache_evicts_least_recently_used_past_max_entries(monkeypatch):
+    monkeypatch.setattr(upstream, 'MAX_ENTRIES', 3)
+
+    with mock.patch('requests.get', return_value=FakeResponse({})):
+        for page in ('1', '2', '3'):
+            upstream.get(URL, params={'page': page})
+        # Usar a página 1 a torna a mais recente; a 2 passa a ser a menos usada
+        assert upstream.get_cached(URL, {'page': '1'}) is not None
+        upstream.get(URL, params={'page': '4'})
+
+    assert len(upstream._cache) == 3
+    assert upstream.get_cached(URL, {'page': '2'}) is None
+    for page in ('1', '3', '4'):
+        assert upstream.get_cached(URL, {'page': page}) is not None
+
+
+def test_entries_older_than_max_stale_are_dropped():
+    with mock.patch('requests.get', return_value=FakeResponse({})):
+        upstream.get(URL, params={'page': '1'})
+        upstream.get(URL, params={'page': '2'})
+    expire(params={'page': '1'}, age=upstream.MAX_STALE + 1)
+
+    # Nunca servida como dado antigo...
+    with mock.patch('requests.get', return_value=FakeResponse({}, 429)):
+        assert upstream.get(URL, params={'page': '1'}) is None
+    assert upstream.cache_key(URL, {'page': '1'}) not in upstream._cache
+
+    # ...e removida quando outra entrada é gravada
+    expire(params={'page': '2'}, age=upstream.MAX_STALE + 1)
+    with mock.patch('requests.get', return_value=FakeResponse({})):
+        upstream.get(URL, params={'page': '3'})
+    assert upstream.cache_key(URL, {'page': '2'}) not in upstream._cache
+
+
+def test_version_changes_only_with_upstream_content():
+    with mock.patch('requests.get', return_value=FakeResponse({'a': 1})):
+        first = upstream.get(URL, ttl=0)
+        same = upstream.get(URL, ttl=0)
+    with mock.patch('requests.get', return_value=FakeResponse({'a': 2})):
+        changed = upstream.get(URL, ttl=0)
+
+    assert first['version'] == same['version']
+    assert first['version'] != changed['version']
+    assert time.time() - changed['fetched_at'] < 5
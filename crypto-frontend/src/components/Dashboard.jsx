@@ -21,6 +21,7 @@ const Dashboard = () => {
   const [searchTerm, setSearchTerm] = useState('');
   const [loading, setLoading] = useState(true);
   const [fearGreedIndex, setFearGreedIndex] = useState(null);
+  const [sectionIssues, setSectionIssues] = useState([]);
 
   // Cores para os gráficos
   const COLORS = ['#0088FE', '#00C49F', '#FFBB28', '#FF8042', '#8884D8'];
@@ -32,12 +33,25 @@ const Dashboard = () => {
   const fetchInitialData = async () => {
     setLoading(true);
     try {
-      await Promise.all([
-        fetchMarketData(),
-        fetchGlobalData(),
-        fetchTrendingCoins(),
-        fetchFearGreedIndex()
-      ]);
+      // Um único endpoint agrega mercado, dados globais, tendências e medo/ganância
+      const response = await fetch(`${API_BASE_URL}/dashboard`);
+      if (!response.ok) {
+        throw new Error(`HTTP ${response.status}`);
+      }
+      const { sections = {} } = await response.json();
+      setMarketData(sections.markets?.data || []);
+      setGlobalData(sections.global?.data?.data || null);
+      setTrendingCoins(sections.trending?.data?.coins || []);
+      setFearGreedIndex(sections.fear_greed?.data?.data?.[0] || null);
+
+      // Seções com erro no upstream: sem dados ou servidas a partir de dados antigos
+      const issues = Object.entries(sections)
+        .filter(([, section]) => section.error)
+        .map(([name, section]) => ({ name, error: section.error, stale: Boolean(section.stale), fetchedAt: section.fetched_at }));
+      issues.forEach(({ name, error, stale }) => {
+        console.warn(`Seção ${name} do dashboard ${stale ? 'com dados antigos' : 'indisponível'}: ${error}`);
+      });
+      setSectionIssues(issues);
     } catch (error) {
       console.error('Erro ao carregar dados iniciais:', error);
     } finally {
@@ -45,46 +59,6 @@ const Dashboard = () => {
     }
   };
 
-  const fetchMarketData = async () => {
-    try {
-      const response = await fetch(`${API_BASE_URL}/coins/markets?per_page=50`);
-      const data = await response.json();
-      setMarketData(data);
-    } catch (error) {
-      console.error('Erro ao buscar dados de mercado:', error);
-    }
-  };
-
-  const fetchGlobalData = async () => {
-    try {
-      const response = await fetch(`${API_BASE_URL}/global`);
-      const data = await response.json();
-      setGlobalData(data.data);
-    } catch (error) {
-      console.error('Erro ao buscar dados globais:', error);
-    }
-  };
-
-  const fetchTrendingCoins = async () => {
-    try {
-      const response = await fetch(`${API_BASE_URL}/trending`);
-      const data = await response.json();
-      setTrendingCoins(data.coins || []);
-    } catch (error) {
-      console.error('Erro ao buscar moedas em tendência:', error);
-    }
-  };
-
-  const fetchFearGreedIndex = async () => {
-    try {
-      const response = await fetch(`${API_BASE_URL}/fear-greed`);
-      const data = await response.json();
-      setFearGreedIndex(data.data?.[0]);
-    } catch (error) {
-      console.error('Erro ao buscar índice de medo e ganância:', error);
-    }
-  };
-
   const fetchCoinHistory = async (coinId) => {
     try {
       const response = await fetch(`${API_BASE_URL}/coins/${coinId}/history?days=30`);
@@ -161,6 +135,19 @@ const Dashboard = () => {
           </Button>
         </div>
 
+        {/* Avisos de seções desatualizadas ou indisponíveis */}
+        {sectionIssues.length > 0 && (
+          <div className="flex flex-wrap gap-2">
+            {sectionIssues.map(({ name, error, stale, fetchedAt }) => (
+              <Badge key={name} variant="outline" className="text-yellow-400 border-yellow-400" title={error}>
+                {stale
+                  ? `${name}: dados de ${new Date(fetchedAt).toLocaleTimeString()}`
+                  : `${name}: indisponível`}
+              </Badge>
+            ))}
+          </div>
+        )}
+
         {/* Cards de Estatísticas Globais */}
         {globalData && (
           <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-6 gap-4">